@@ -1,9 +1,12 @@
 """
 source reference: https://github.com/nameko/nameko/pull/357
 """
+import threading
 import weakref
 import os
 
+from cachetools import TTLCache
+from kombu.entity import TRANSIENT_DELIVERY_MODE
 from six.moves import xrange as xrange_six, queue as queue_six
 from nameko.standalone.rpc import ClusterRpcClient
 from nameko import config
@@ -12,7 +15,9 @@ from nameko.cli.utils.config import setup_config
 class ClusterRpcProxyPool(object):
     """ Connection pool for Nameko RPC cluster.
     Pool size can be customized by passing `pool_size` kwarg to constructor.
-    Default size is 2 per uvicorn worker (should be enough)
+    Default size is 2 per uvicorn worker; size it to the number of requests
+    a worker serves concurrently (`RPC_POOL_SIZE` in config.yml)
+    Any other kwargs are passed on to each client's publisher.
     *Usage*
         pool = ClusterRpcProxyPool(config)
         pool.start()
@@ -24,9 +29,10 @@ class ClusterRpcProxyPool(object):
     This class is thread-safe and designed to work with GEvent.
     """
     class RpcContext(object):
-        def __init__(self, pool, uri, timeout):
+        def __init__(self, pool, uri, timeout, publisher_options):
             self.pool = weakref.proxy(pool)
-            self.proxy = ClusterRpcClient(uri=uri, timeout=timeout)
+            self.proxy = ClusterRpcClient(
+                uri=uri, timeout=timeout, **publisher_options)
             self.rpc = self.proxy.start()
 
         def stop(self):
@@ -45,17 +51,19 @@ class ClusterRpcProxyPool(object):
                 # is going to silently die.
                 self.stop()
 
-    def __init__(self, uri, timeout=None, pool_size=2):
+    def __init__(self, uri, timeout=None, pool_size=2, **publisher_options):
         self.uri = uri
         self.timeout = timeout
         self.pool_size = pool_size
+        self.publisher_options = publisher_options
 
     def start(self):
         """ Populate pool with connections.
         """
         self.queue = queue_six.Queue()
         for i in xrange_six(self.pool_size):
-            ctx = ClusterRpcProxyPool.RpcContext(self, self.uri, self.timeout)
+            ctx = ClusterRpcProxyPool.RpcContext(
+                self, self.uri, self.timeout, self.publisher_options)
             self.queue.put(ctx)
 
     def next(self, timeout=None):
@@ -88,14 +96,55 @@ else:
 
 NAMEKO_POOL = ClusterRpcProxyPool(
     uri=config['AMQP_URI'],
-    timeout=None
+    timeout=None,
+    pool_size=config.get('RPC_POOL_SIZE', 2),
+    # RPC requests are short-lived, so don't persist them to disk on the
+    # broker. Publish confirms stay on: nameko needs them to raise
+    # UnknownService instead of waiting forever for a reply.
+    delivery_mode=TRANSIENT_DELIVERY_MODE
 )
-NAMEKO_POOL.start()
+
+def start_nameko_pool():
+    NAMEKO_POOL.start()
 
 def destroy_nameko_pool():
     NAMEKO_POOL.stop()
 
-def get_rpc():
+async def get_rpc():
+    # Declared async so FastAPI resolves it on the event loop instead of
+    # hopping onto the threadpool just to hand back the pool.
     yield NAMEKO_POOL
 
+# Per-worker cache of recently fetched products. Handlers run on a
+# threadpool, so access is serialized with a lock. Every order changes
+# `in_stock`, so order views may show stock up to one TTL out of date.
+PRODUCT_CACHE = TTLCache(maxsize=10000, ttl=60)
+PRODUCT_CACHE_LOCK = threading.Lock()
+
+def get_products(nameko, product_ids):
+    """ Return an `{id: product}` map for `product_ids`, only asking the
+    products service for the ones missing from the cache.
+    """
+    product_map = {}
+    missing_ids = []
+    with PRODUCT_CACHE_LOCK:
+        for product_id in product_ids:
+            product = PRODUCT_CACHE.get(product_id)
+            if product is None:
+                missing_ids.append(product_id)
+            else:
+                product_map[product_id] = product
+
+    if missing_ids:
+        fetched = nameko.products.list_map(missing_ids)
+        with PRODUCT_CACHE_LOCK:
+            PRODUCT_CACHE.update(fetched)
+        product_map.update(fetched)
+
+    return product_map
+
+def invalidate_product(product_id):
+    with PRODUCT_CACHE_LOCK:
+        PRODUCT_CACHE.pop(product_id, None)
+
 config = config
\ No newline at end of file
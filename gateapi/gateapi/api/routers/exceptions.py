@@ -28,3 +28,12 @@ class OrderNotFound(Exception):
 @remote_error('products.exceptions.NotFound')
 class ProductNotFound(Exception):
     pass
+
+
+@remote_error('products.exceptions.OutdatedProductFormat')
+class ProductStorageOutdated(Exception):
+    """
+    Raised when the product is still stored in the Redis hash layout
+    and needs `python -m products.migrate` to be run.
+    """
+    pass
@@ -1,39 +1,48 @@
 from os import name
 from fastapi import APIRouter, status, HTTPException
 from fastapi.params import Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
 from gateapi.api import schemas
-from gateapi.api.dependencies import get_rpc, config
-from .exceptions import OrderNotFound
+from gateapi.api.dependencies import get_rpc, get_products, config
+from .exceptions import OrderNotFound, ProductStorageOutdated
 
 router = APIRouter(
     prefix = "/orders",
     tags = ['Orders']
 )
 
-@router.get("/{order_id}", status_code=status.HTTP_200_OK)
+@router.get("/{order_id}", status_code=status.HTTP_200_OK, response_class=ORJSONResponse, responses={200: {"model": schemas.Order}})
 def get_order(order_id: int, rpc = Depends(get_rpc)):
     try:
-        return _get_order(order_id, rpc)
+        # The order is assembled from trusted RPC replies, so serialize it
+        # directly rather than re-validating it against a response model.
+        return ORJSONResponse(_get_order(order_id, rpc))
     except OrderNotFound as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(error)
         )
+    except ProductStorageOutdated as error:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(error)
+        )
 
 def _get_order(order_id, nameko_rpc):
-    # Retrieve order data from the orders service.
-    # Note - this may raise a remote exception that has been mapped to
-    # raise``OrderNotFound``
     with nameko_rpc.next() as nameko:
+        # Retrieve order data from the orders service.
+        # Note - this may raise a remote exception that has been mapped to
+        # raise``OrderNotFound``
         order = nameko.orders.get_order(order_id)
 
-    # Retrieve all products from the products service
-    with nameko_rpc.next() as nameko:
-        product_map = {prod['id']: prod for prod in nameko.products.list()}
+        # Retrieve the products in this order
+        product_map = get_products(
+            nameko, {item['product_id'] for item in order['order_details']}
+        )
 
     # get the configured image root
-    image_root = config['PRODUCT_IMAGE_ROOT']
+    image_prefix = config['PRODUCT_IMAGE_ROOT'] + '/'
 
     # Enhance order details with product and image details.
     for item in order['order_details']:
@@ -41,13 +50,19 @@ def _get_order(order_id, nameko_rpc):
 
         item['product'] = product_map[product_id]
         # Construct an image url.
-        item['image'] = '{}/{}.jpg'.format(image_root, product_id)
+        item['image'] = image_prefix + product_id + '.jpg'
 
     return order
 
 @router.post("", status_code=status.HTTP_200_OK, response_model=schemas.CreateOrderSuccess)
 def create_order(request: schemas.CreateOrder, rpc = Depends(get_rpc)):
-    id_ =  _create_order(request.dict(), rpc)
+    try:
+        id_ =  _create_order(request.dict(), rpc)
+    except ProductStorageOutdated as error:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(error)
+        )
     return {
         'id': id_
     }
@@ -55,11 +70,18 @@ def create_order(request: schemas.CreateOrder, rpc = Depends(get_rpc)):
 def _create_order(order_data, nameko_rpc):
     # check order product ids are valid
     with nameko_rpc.next() as nameko:
-        valid_product_ids = {prod['id'] for prod in nameko.products.list()}
-        for item in order_data['order_details']:
-            if item['product_id'] not in valid_product_ids:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                                    detail=f"Product with id {item['product_id']} not found"
+        product_ids = [item['product_id'] for item in order_data['order_details']]
+        missing_ids = set(product_ids).difference(
+            nameko.products.exists(product_ids)
+        )
+        if missing_ids:
+            # report the first unknown product in the order's own ordering
+            missing_id = next(
+                product_id for product_id in product_ids
+                if product_id in missing_ids
+            )
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail=f"Product with id {missing_id} not found"
             )
         # Call orders-service to create the order.
         result = nameko.orders.create_order(
@@ -1,29 +1,36 @@
 from fastapi import APIRouter, status, HTTPException
 from fastapi.params import Depends
-from gateapi.api.dependencies import get_rpc
+from fastapi.responses import ORJSONResponse
+from gateapi.api.dependencies import get_rpc, invalidate_product
 from gateapi.api import schemas
-from .exceptions import ProductNotFound
+from .exceptions import ProductNotFound, ProductStorageOutdated
 
 router = APIRouter(
     prefix = "/products",
     tags = ["Products"]
 )
 
-@router.get("/{product_id}", status_code=status.HTTP_200_OK, response_model=schemas.Product)
+@router.get("/{product_id}", status_code=status.HTTP_200_OK, response_class=ORJSONResponse, responses={200: {"model": schemas.Product}})
 def get_product(product_id: str, rpc = Depends(get_rpc)):
     try: 
         with rpc.next() as nameko:
-            return nameko.products.get(product_id)
+            return ORJSONResponse(nameko.products.get(product_id))
     except ProductNotFound as error:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(error)
         )
+    except ProductStorageOutdated as error:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(error)
+        )
 
 @router.post("", status_code=status.HTTP_200_OK, response_model=schemas.CreateProductSuccess)
 def create_product(request: schemas.Product, rpc = Depends(get_rpc)):
     with rpc.next() as nameko:
         nameko.products.create(request.dict())
+        invalidate_product(request.id)
         return {
             "id": request.id
         }
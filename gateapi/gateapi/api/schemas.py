@@ -9,6 +9,19 @@ class Product(BaseModel):
     in_stock: int
 
 
+class OrderDetail(BaseModel):
+    id: int
+    product_id: str
+    price: str
+    quantity: int
+    image: str
+    product: Product
+
+class Order(BaseModel):
+    id: int
+    order_details: List[OrderDetail]
+
+
 class CreateOrderDetail(BaseModel):
     product_id: str
     price: float
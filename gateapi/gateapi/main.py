@@ -1,7 +1,7 @@
 import uvicorn
 from fastapi import FastAPI
 from gateapi.api.routers import order, product
-from gateapi.api.dependencies import destroy_nameko_pool, config
+from gateapi.api.dependencies import start_nameko_pool, destroy_nameko_pool, config
 
 app = FastAPI()
 
@@ -12,7 +12,8 @@ app.include_router(product.router)
 # Setting up nameko cluster rpc client pool connections
 @app.on_event("startup")
 async def startup_event():
-    pass
+    # connect in each serving worker rather than at import time
+    start_nameko_pool()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -1,11 +1,12 @@
-import json
-
+import orjson
 from marshmallow import ValidationError
 from nameko.exceptions import safe_for_serialization, BadRequest
 from nameko.web.handlers import HttpRequestHandler
 from werkzeug import Response
 
-from gateway.exceptions import ProductNotFound, OrderNotFound
+from gateway.exceptions import (
+    OrderNotFound, ProductNotFound, ProductStorageOutdated
+)
 
 
 class HttpEntrypoint(HttpRequestHandler):
@@ -17,6 +18,7 @@ class HttpEntrypoint(HttpRequestHandler):
         ValidationError: (400, 'VALIDATION_ERROR'),
         ProductNotFound: (404, 'PRODUCT_NOT_FOUND'),
         OrderNotFound: (404, 'ORDER_NOT_FOUND'),
+        ProductStorageOutdated: (500, 'PRODUCT_STORAGE_OUTDATED'),
     }
 
     def response_from_exception(self, exc):
@@ -30,7 +32,7 @@ class HttpEntrypoint(HttpRequestHandler):
                 error_code = 'BAD_REQUEST'
 
         return Response(
-            json.dumps({
+            orjson.dumps({
                 'error': error_code,
                 'message': safe_for_serialization(exc),
             }),
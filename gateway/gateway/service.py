@@ -1,5 +1,5 @@
-import json
-
+import orjson
+from cachetools import TTLCache
 from marshmallow import ValidationError
 from nameko import config
 from nameko.exceptions import BadRequest
@@ -7,10 +7,25 @@ from nameko.rpc import RpcProxy
 from werkzeug import Response
 
 from gateway.entrypoints import http
-from gateway.exceptions import OrderNotFound, ProductNotFound
+from gateway.exceptions import (
+    OrderNotFound, ProductNotFound, ProductStorageOutdated
+)
 from gateway.schemas import CreateOrderSchema, GetOrderSchema, ProductSchema
 
 
+_PRODUCT_SCHEMA = ProductSchema()
+_LOAD_PRODUCT_SCHEMA = ProductSchema(strict=True)
+_GET_ORDER_SCHEMA = GetOrderSchema()
+_CREATE_ORDER_SCHEMA = CreateOrderSchema()
+_LOAD_CREATE_ORDER_SCHEMA = CreateOrderSchema(strict=True)
+
+# Products change rarely, so recently fetched ones are kept for a short
+# while to spare the products service a round trip on every order view.
+# The exception is `in_stock`, which every order changes, so order views
+# may show stock up to one TTL out of date.
+_PRODUCT_CACHE = TTLCache(maxsize=10000, ttl=60)
+
+
 class GatewayService(object):
     """
     Service acts as a gateway to other services over http.
@@ -23,14 +38,14 @@ class GatewayService(object):
 
     @http(
         "GET", "/products/<string:product_id>",
-        expected_exceptions=ProductNotFound
+        expected_exceptions=(ProductNotFound, ProductStorageOutdated)
     )
     def get_product(self, request, product_id):
         """Gets product by `product_id`
         """
         product = self.products_rpc.get(product_id)
         return Response(
-            ProductSchema().dumps(product).data,
+            orjson.dumps(_PRODUCT_SCHEMA.dump(product).data),
             mimetype='application/json'
         )
 
@@ -58,7 +73,7 @@ class GatewayService(object):
 
         """
 
-        schema = ProductSchema(strict=True)
+        schema = _LOAD_PRODUCT_SCHEMA
 
         try:
             # load input data through a schema (for validation)
@@ -70,11 +85,16 @@ class GatewayService(object):
 
         # Create the product
         self.products_rpc.create(product_data)
+        _PRODUCT_CACHE.pop(product_data['id'], None)
         return Response(
-            json.dumps({'id': product_data['id']}), mimetype='application/json'
+            orjson.dumps({'id': product_data['id']}),
+            mimetype='application/json'
         )
 
-    @http("GET", "/orders/<int:order_id>", expected_exceptions=OrderNotFound)
+    @http(
+        "GET", "/orders/<int:order_id>",
+        expected_exceptions=(OrderNotFound, ProductStorageOutdated)
+    )
     def get_order(self, request, order_id):
         """Gets the order details for the order given by `order_id`.
 
@@ -83,7 +103,7 @@ class GatewayService(object):
         """
         order = self._get_order(order_id)
         return Response(
-            GetOrderSchema().dumps(order).data,
+            orjson.dumps(_GET_ORDER_SCHEMA.dump(order).data),
             mimetype='application/json'
         )
 
@@ -93,11 +113,13 @@ class GatewayService(object):
         # raise``OrderNotFound``
         order = self.orders_rpc.get_order(order_id)
 
-        # Retrieve all products from the products service
-        product_map = {prod['id']: prod for prod in self.products_rpc.list()}
+        # Retrieve the products in this order
+        product_map = self._get_products(
+            {item['product_id'] for item in order['order_details']}
+        )
 
         # get the configured image root
-        image_root = config['PRODUCT_IMAGE_ROOT']
+        image_prefix = config['PRODUCT_IMAGE_ROOT'] + '/'
 
         # Enhance order details with product and image details.
         for item in order['order_details']:
@@ -105,13 +127,35 @@ class GatewayService(object):
 
             item['product'] = product_map[product_id]
             # Construct an image url.
-            item['image'] = '{}/{}.jpg'.format(image_root, product_id)
+            item['image'] = image_prefix + product_id + '.jpg'
 
         return order
 
+    def _get_products(self, product_ids):
+        # Serve what we can from the product cache and only ask the
+        # products service for the rest.
+        product_map = {}
+        missing_ids = []
+        for product_id in product_ids:
+            product = _PRODUCT_CACHE.get(product_id)
+            if product is None:
+                missing_ids.append(product_id)
+            else:
+                product_map[product_id] = product
+
+        if missing_ids:
+            fetched = self.products_rpc.list_map(missing_ids)
+            _PRODUCT_CACHE.update(fetched)
+            product_map.update(fetched)
+
+        return product_map
+
     @http(
         "POST", "/orders",
-        expected_exceptions=(ValidationError, ProductNotFound, BadRequest)
+        expected_exceptions=(
+            ValidationError, ProductNotFound, ProductStorageOutdated,
+            BadRequest
+        )
     )
     def create_order(self, request):
         """Create a new order - order data is posted as json
@@ -140,7 +184,7 @@ class GatewayService(object):
 
         """
 
-        schema = CreateOrderSchema(strict=True)
+        schema = _LOAD_CREATE_ORDER_SCHEMA
 
         try:
             # load input data through a schema (for validation)
@@ -153,21 +197,28 @@ class GatewayService(object):
         # Create the order
         # Note - this may raise `ProductNotFound`
         id_ = self._create_order(order_data)
-        return Response(json.dumps({'id': id_}), mimetype='application/json')
+        return Response(orjson.dumps({'id': id_}), mimetype='application/json')
 
     def _create_order(self, order_data):
         # check order product ids are valid
-        valid_product_ids = {prod['id'] for prod in self.products_rpc.list()}
-        for item in order_data['order_details']:
-            if item['product_id'] not in valid_product_ids:
-                raise ProductNotFound(
-                    "Product Id {}".format(item['product_id'])
-                )
+        product_ids = [
+            item['product_id'] for item in order_data['order_details']
+        ]
+        missing_ids = set(product_ids).difference(
+            self.products_rpc.exists(product_ids)
+        )
+        if missing_ids:
+            # report the first unknown product in the order's own ordering
+            missing_id = next(
+                product_id for product_id in product_ids
+                if product_id in missing_ids
+            )
+            raise ProductNotFound("Product Id {}".format(missing_id))
 
         # Call orders-service to create the order.
         # Dump the data through the schema to ensure the values are serialized
         # correctly.
-        serialized_data = CreateOrderSchema().dump(order_data).data
+        serialized_data = _CREATE_ORDER_SCHEMA.dump(order_data).data
         result = self.orders_rpc.create_order(
             serialized_data['order_details']
         )
@@ -24,7 +24,7 @@ from collections import namedtuple
 from nameko import config
 from nameko.testing.services import replace_dependencies
 
-from gateway.service import GatewayService
+from gateway.service import GatewayService, _PRODUCT_CACHE
 
 
 @pytest.yield_fixture
@@ -35,6 +35,12 @@ def test_config(web_config, rabbit_config):
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_product_cache():
+    yield
+    _PRODUCT_CACHE.clear()
+
+
 @pytest.fixture
 def create_service_meta(container_factory, test_config):
     """ Returns a convenience method for creating service test instance
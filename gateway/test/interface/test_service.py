@@ -2,7 +2,9 @@ import json
 
 from mock import call
 
-from gateway.exceptions import OrderNotFound, ProductNotFound
+from gateway.exceptions import (
+    OrderNotFound, ProductNotFound, ProductStorageOutdated
+)
 
 
 class TestGetProduct(object):
@@ -38,6 +40,16 @@ class TestGetProduct(object):
         assert payload['error'] == 'PRODUCT_NOT_FOUND'
         assert payload['message'] == 'missing'
 
+    def test_product_storage_outdated(self, gateway_service, web_session):
+        gateway_service.products_rpc.get.side_effect = (
+            ProductStorageOutdated('outdated'))
+
+        response = web_session.get('/products/foo')
+        assert response.status_code == 500
+        payload = response.json()
+        assert payload['error'] == 'PRODUCT_STORAGE_OUTDATED'
+        assert payload['message'] == 'outdated'
+
 
 class TestCreateProduct(object):
     def test_can_create_product(self, gateway_service, web_session):
@@ -104,22 +116,22 @@ class TestGetOrder(object):
         }
 
         # setup mock products-service response:
-        gateway_service.products_rpc.list.return_value = [
-            {
+        gateway_service.products_rpc.list_map.return_value = {
+            'the_odyssey': {
                 'id': 'the_odyssey',
                 'title': 'The Odyssey',
                 'maximum_speed': 3,
                 'in_stock': 899,
                 'passenger_capacity': 100
             },
-            {
+            'the_enigma': {
                 'id': 'the_enigma',
                 'title': 'The Enigma',
                 'maximum_speed': 200,
                 'in_stock': 1,
                 'passenger_capacity': 4
             },
-        ]
+        }
 
         # call the gateway service to get order #1
         response = web_session.get('/orders/1')
@@ -164,7 +176,118 @@ class TestGetOrder(object):
 
         # check dependencies called as expected
         assert [call(1)] == gateway_service.orders_rpc.get_order.call_args_list
-        assert [call()] == gateway_service.products_rpc.list.call_args_list
+        (product_ids,), _ = gateway_service.products_rpc.list_map.call_args
+        assert ['the_enigma', 'the_odyssey'] == sorted(product_ids)
+        assert 1 == gateway_service.products_rpc.list_map.call_count
+
+    def test_get_order_reuses_cached_products(
+        self, gateway_service, web_session
+    ):
+        gateway_service.orders_rpc.get_order.side_effect = [
+            {
+                'id': 1,
+                'order_details': [
+                    {
+                        'id': 1,
+                        'quantity': 2,
+                        'product_id': 'the_odyssey',
+                        'price': '200.00'
+                    },
+                ]
+            },
+            {
+                'id': 2,
+                'order_details': [
+                    {
+                        'id': 2,
+                        'quantity': 1,
+                        'product_id': 'the_odyssey',
+                        'price': '200.00'
+                    },
+                    {
+                        'id': 3,
+                        'quantity': 1,
+                        'product_id': 'the_enigma',
+                        'price': '400.00'
+                    },
+                ]
+            },
+        ]
+        gateway_service.products_rpc.list_map.side_effect = [
+            {
+                'the_odyssey': {
+                    'id': 'the_odyssey',
+                    'title': 'The Odyssey',
+                    'maximum_speed': 3,
+                    'in_stock': 899,
+                    'passenger_capacity': 100
+                },
+            },
+            {
+                'the_enigma': {
+                    'id': 'the_enigma',
+                    'title': 'The Enigma',
+                    'maximum_speed': 200,
+                    'in_stock': 1,
+                    'passenger_capacity': 4
+                },
+            },
+        ]
+
+        assert web_session.get('/orders/1').status_code == 200
+        response = web_session.get('/orders/2')
+        assert response.status_code == 200
+        assert ['the_odyssey', 'the_enigma'] == [
+            item['product']['id'] for item in response.json()['order_details']
+        ]
+
+        # only the product missing from the cache is fetched the second time
+        assert [call(['the_odyssey']), call(['the_enigma'])] == (
+            gateway_service.products_rpc.list_map.call_args_list)
+
+    def test_create_product_invalidates_cached_product(
+        self, gateway_service, web_session
+    ):
+        gateway_service.orders_rpc.get_order.return_value = {
+            'id': 1,
+            'order_details': [
+                {
+                    'id': 1,
+                    'quantity': 2,
+                    'product_id': 'the_odyssey',
+                    'price': '200.00'
+                },
+            ]
+        }
+        gateway_service.products_rpc.list_map.return_value = {
+            'the_odyssey': {
+                'id': 'the_odyssey',
+                'title': 'The Odyssey',
+                'maximum_speed': 3,
+                'in_stock': 899,
+                'passenger_capacity': 100
+            },
+        }
+
+        # viewing the order fills the cache
+        assert web_session.get('/orders/1').status_code == 200
+
+        # overwriting the product evicts it from the cache
+        response = web_session.post(
+            '/products',
+            json.dumps({
+                "in_stock": 10,
+                "maximum_speed": 5,
+                "id": "the_odyssey",
+                "passenger_capacity": 101,
+                "title": "The Odyssey"
+            })
+        )
+        assert response.status_code == 200
+
+        assert web_session.get('/orders/1').status_code == 200
+        assert [call(['the_odyssey']), call(['the_odyssey'])] == (
+            gateway_service.products_rpc.list_map.call_args_list)
 
     def test_order_not_found(self, gateway_service, web_session):
         gateway_service.orders_rpc.get_order.side_effect = (
@@ -182,22 +305,7 @@ class TestCreateOrder(object):
 
     def test_can_create_order(self, gateway_service, web_session):
         # setup mock products-service response:
-        gateway_service.products_rpc.list.return_value = [
-            {
-                'id': 'the_odyssey',
-                'title': 'The Odyssey',
-                'maximum_speed': 3,
-                'in_stock': 899,
-                'passenger_capacity': 100
-            },
-            {
-                'id': 'the_enigma',
-                'title': 'The Enigma',
-                'maximum_speed': 200,
-                'in_stock': 1,
-                'passenger_capacity': 4
-            },
-        ]
+        gateway_service.products_rpc.exists.return_value = ['the_odyssey']
 
         # setup mock create response
         gateway_service.orders_rpc.create_order.return_value = {
@@ -220,7 +328,9 @@ class TestCreateOrder(object):
         )
         assert response.status_code == 200
         assert response.json() == {'id': 11}
-        assert gateway_service.products_rpc.list.call_args_list == [call()]
+        assert gateway_service.products_rpc.exists.call_args_list == [
+            call(['the_odyssey'])
+        ]
         assert gateway_service.orders_rpc.create_order.call_args_list == [
             call([
                 {'product_id': 'the_odyssey', 'quantity': 3, 'price': '41.00'}
@@ -259,22 +369,7 @@ class TestCreateOrder(object):
         self, gateway_service, web_session
     ):
         # setup mock products-service response:
-        gateway_service.products_rpc.list.return_value = [
-            {
-                'id': 'the_odyssey',
-                'title': 'The Odyssey',
-                'maximum_speed': 3,
-                'in_stock': 899,
-                'passenger_capacity': 100
-            },
-            {
-                'id': 'the_enigma',
-                'title': 'The Enigma',
-                'maximum_speed': 200,
-                'in_stock': 1,
-                'passenger_capacity': 4
-            },
-        ]
+        gateway_service.products_rpc.exists.return_value = []
 
         # call the gateway service to create the order
         response = web_session.post(
@@ -292,3 +387,60 @@ class TestCreateOrder(object):
         assert response.status_code == 404
         assert response.json()['error'] == 'PRODUCT_NOT_FOUND'
         assert response.json()['message'] == 'Product Id unknown'
+
+    def test_create_order_reports_first_unknown_product(
+        self, gateway_service, web_session
+    ):
+        # setup mock products-service response:
+        gateway_service.products_rpc.exists.return_value = ['the_odyssey']
+
+        # call the gateway service to create the order
+        response = web_session.post(
+            '/orders',
+            json.dumps({
+                'order_details': [
+                    {
+                        'product_id': 'the_odyssey',
+                        'price': '41',
+                        'quantity': 1
+                    },
+                    {
+                        'product_id': 'unknown_one',
+                        'price': '41',
+                        'quantity': 1
+                    },
+                    {
+                        'product_id': 'unknown_two',
+                        'price': '41',
+                        'quantity': 1
+                    }
+                ]
+            })
+        )
+        assert response.status_code == 404
+        assert response.json()['error'] == 'PRODUCT_NOT_FOUND'
+        assert response.json()['message'] == 'Product Id unknown_one'
+        assert not gateway_service.orders_rpc.create_order.called
+
+    def test_create_order_fails_with_outdated_product_storage(
+        self, gateway_service, web_session
+    ):
+        gateway_service.products_rpc.exists.side_effect = (
+            ProductStorageOutdated('outdated'))
+
+        response = web_session.post(
+            '/orders',
+            json.dumps({
+                'order_details': [
+                    {
+                        'product_id': 'the_odyssey',
+                        'price': '41',
+                        'quantity': 1
+                    }
+                ]
+            })
+        )
+        assert response.status_code == 500
+        assert response.json()['error'] == 'PRODUCT_STORAGE_OUTDATED'
+        assert response.json()['message'] == 'outdated'
+        assert not gateway_service.orders_rpc.create_order.called
@@ -3,7 +3,9 @@ import pytest
 from marshmallow import ValidationError
 
 from gateway.entrypoints import HttpEntrypoint
-from gateway.exceptions import ProductNotFound, OrderNotFound
+from gateway.exceptions import (
+    OrderNotFound, ProductNotFound, ProductStorageOutdated
+)
 
 
 class TestHttpEntrypoint(object):
@@ -15,6 +17,8 @@ class TestHttpEntrypoint(object):
             (ValidationError('v1'), 'VALIDATION_ERROR', 400, 'v1'),
             (ProductNotFound('p1'), 'PRODUCT_NOT_FOUND', 404, 'p1'),
             (OrderNotFound('o1'), 'ORDER_NOT_FOUND', 404, 'o1'),
+            (ProductStorageOutdated('s1'), 'PRODUCT_STORAGE_OUTDATED', 500,
+                's1'),
             (TypeError('t1'), 'BAD_REQUEST', 400, 't1'),
         ]
     )
@@ -26,6 +30,7 @@ class TestHttpEntrypoint(object):
             ValidationError,
             ProductNotFound,
             OrderNotFound,
+            ProductStorageOutdated,
             TypeError,
         )
 
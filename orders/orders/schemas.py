@@ -1,10 +1,15 @@
+import decimal
+
 from marshmallow import Schema, fields
 
 
 class OrderDetailSchema(Schema):
     id = fields.Int(required=True)
     product_id = fields.Str(required=True)
-    price = fields.Decimal(as_string=True)
+    # Match the DECIMAL(18, 2) column, so prices echoed straight from the
+    # input serialize exactly as they read back from the database.
+    price = fields.Decimal(
+        places=2, rounding=decimal.ROUND_HALF_UP, as_string=True)
     quantity = fields.Int()
 
 
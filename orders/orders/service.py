@@ -1,43 +1,64 @@
 from nameko.events import EventDispatcher
 from nameko.rpc import rpc
 from nameko_sqlalchemy import DatabaseSession
+from sqlalchemy.orm import joinedload
 
 from orders.exceptions import NotFound
 from orders.models import DeclarativeBase, Order, OrderDetail
 from orders.schemas import OrderSchema
 
 
+_ORDER_SCHEMA = OrderSchema()
+
+
 class OrdersService:
     name = 'orders'
 
     db = DatabaseSession(DeclarativeBase)
     event_dispatcher = EventDispatcher()
 
+    def _query_orders(self):
+        # Load order details in the same query as their order instead of
+        # lazily issuing a second SELECT when they are first accessed.
+        return self.db.query(Order).options(joinedload(Order.order_details))
+
     @rpc
     def get_order(self, order_id):
-        order = self.db.query(Order).get(order_id)
+        order = self._query_orders().get(order_id)
 
         if not order:
             raise NotFound('Order with id {} not found'.format(order_id))
 
-        return OrderSchema().dump(order).data
+        return _ORDER_SCHEMA.dump(order).data
 
     @rpc
     def create_order(self, order_details):
-        order = Order(
-            order_details=[
-                OrderDetail(
-                    product_id=order_detail['product_id'],
-                    price=order_detail['price'],
-                    quantity=order_detail['quantity']
-                )
-                for order_detail in order_details
-            ]
-        )
+        order = Order()
         self.db.add(order)
+        # Flush to get the new order id, then bulk insert its details
+        # without building and tracking an ORM object for each one.
+        self.db.flush()
+        order_id = order.id
+
+        order_detail_rows = [
+            {
+                'order_id': order_id,
+                'product_id': order_detail['product_id'],
+                'price': order_detail['price'],
+                'quantity': order_detail['quantity'],
+            }
+            for order_detail in order_details
+        ]
+        self.db.bulk_insert_mappings(
+            OrderDetail, order_detail_rows, return_defaults=True)
         self.db.commit()
 
-        order = OrderSchema().dump(order).data
+        # Build the response from the inserted rows rather than reloading
+        # the committed order from the database.
+        order = _ORDER_SCHEMA.dump({
+            'id': order_id,
+            'order_details': order_detail_rows,
+        }).data
 
         self.event_dispatcher('order_created', {
             'order': order,
@@ -52,14 +73,14 @@ class OrdersService:
             for order_details in order['order_details']
         }
 
-        order = self.db.query(Order).get(order['id'])
+        order = self._query_orders().get(order['id'])
 
         for order_detail in order.order_details:
             order_detail.price = order_details[order_detail.id]['price']
             order_detail.quantity = order_details[order_detail.id]['quantity']
 
         self.db.commit()
-        return OrderSchema().dump(order).data
+        return _ORDER_SCHEMA.dump(order).data
 
     @rpc
     def delete_order(self, order_id):
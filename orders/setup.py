@@ -9,6 +9,7 @@ setup(
     install_requires=[
         'nameko==v3.0.0-rc6',
         'nameko-sqlalchemy==1.5.0',
+        'orjson==3.8.3',
         'alembic==1.0.10',
         'marshmallow==2.19.2',
         'psycopg2-binary==2.8.2',
@@ -2,6 +2,8 @@ import pytest
 
 from mock import call
 from nameko.exceptions import RemoteError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from orders.models import Order, OrderDetail
 from orders.schemas import OrderSchema, OrderDetailSchema
@@ -34,6 +36,35 @@ def test_get_order(orders_rpc, order):
     assert response['id'] == order.id
 
 
+@pytest.fixture
+def select_statements():
+    """ Records the SELECT statements issued on any engine """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(Engine, 'before_cursor_execute', record)
+
+
+@pytest.mark.usefixtures('order_details')
+def test_get_order_loads_order_details_in_one_query(
+    orders_rpc, order, select_statements
+):
+    order_id = order.id
+    del select_statements[:]
+
+    response = orders_rpc.get_order(order_id)
+
+    assert 1 == len(select_statements)
+    assert ['the_odyssey', 'the_enigma'] == [
+        detail['product_id'] for detail in response['order_details']
+    ]
+
+
 @pytest.mark.usefixtures('db_session')
 def test_will_raise_when_order_not_found(orders_rpc):
     with pytest.raises(RemoteError) as err:
@@ -80,6 +111,22 @@ def test_can_create_order(orders_service, orders_rpc):
     )] == orders_service.event_dispatcher.call_args_list
 
 
+@pytest.mark.usefixtures('db_session')
+def test_create_order_prices_match_stored_scale(orders_rpc):
+    new_order = orders_rpc.create_order([
+        {'product_id': "the_odyssey", 'price': '41', 'quantity': 1},
+        {'product_id': "the_enigma", 'price': '5.9', 'quantity': 2},
+    ])
+
+    created_prices = [
+        detail['price'] for detail in new_order['order_details']]
+    assert ['41.00', '5.90'] == created_prices
+
+    stored_order = orders_rpc.get_order(new_order['id'])
+    assert created_prices == [
+        detail['price'] for detail in stored_order['order_details']]
+
+
 @pytest.mark.usefixtures('db_session', 'order_details')
 def test_can_update_order(orders_rpc, order):
     order_payload = OrderSchema().dump(order).data
@@ -1,8 +1,9 @@
 from nameko import config
 from nameko.extensions import DependencyProvider
+import msgpack
 import redis
 
-from products.exceptions import NotFound
+from products.exceptions import NotFound, OutdatedProductFormat
 
 
 REDIS_URI_KEY = 'REDIS_URI'
@@ -20,6 +21,7 @@ class StorageWrapper:
     """
 
     NotFound = NotFound
+    OutdatedProductFormat = OutdatedProductFormat
 
     def __init__(self, client):
         self.client = client
@@ -27,35 +29,105 @@ class StorageWrapper:
     def _format_key(self, product_id):
         return 'products:{}'.format(product_id)
 
-    def _from_hash(self, document):
-        return {
-            'id': document[b'id'].decode('utf-8'),
-            'title': document[b'title'].decode('utf-8'),
-            'passenger_capacity': int(document[b'passenger_capacity']),
-            'maximum_speed': int(document[b'maximum_speed']),
-            'in_stock': int(document[b'in_stock'])
-        }
+    def _outdated_format(self, product_id):
+        return OutdatedProductFormat(
+            'Product ID {} is stored in an outdated format, run '
+            '`python -m products.migrate` to convert it'.format(product_id))
+
+    def _get_many(self, keys, client=None):
+        if not keys:
+            return []
+        client = self.client if client is None else client
+        products = []
+        for key, packed in zip(keys, client.mget(keys)):
+            if packed is not None:
+                products.append(msgpack.unpackb(packed))
+                continue
+            # MGET returns None both for missing keys and for products
+            # still stored in the old hash layout, so tell them apart.
+            if client.type(key) != b'none':
+                if isinstance(key, bytes):
+                    key = key.decode('utf-8')
+                raise self._outdated_format(key.split(':', 1)[1])
+            products.append(None)
+        return products
 
     def get(self, product_id):
-        product = self.client.hgetall(self._format_key(product_id))
-        if not product:
+        try:
+            packed = self.client.get(self._format_key(product_id))
+        except redis.ResponseError as exc:
+            if not str(exc).startswith('WRONGTYPE'):
+                raise
+            raise self._outdated_format(product_id)
+        if packed is None:
             raise NotFound('Product ID {} does not exist'.format(product_id))
         else:
-            return self._from_hash(product)
+            return msgpack.unpackb(packed)
 
     def list(self):
         keys = self.client.keys(self._format_key('*'))
-        for key in keys:
-            yield self._from_hash(self.client.hgetall(key))
+        return [
+            product for product in self._get_many(keys)
+            if product is not None
+        ]
+
+    def list_map(self, product_ids):
+        product_ids = list(set(product_ids))
+        products = self._get_many(
+            [self._format_key(product_id) for product_id in product_ids])
+        return {
+            product_id: product
+            for product_id, product in zip(product_ids, products)
+            if product is not None
+        }
+
+    def exists(self, product_ids):
+        product_ids = list(set(product_ids))
+        pipe = self.client.pipeline(transaction=False)
+        for product_id in product_ids:
+            pipe.type(self._format_key(product_id))
+        existing_ids = set()
+        for product_id, key_type in zip(product_ids, pipe.execute()):
+            if key_type == b'string':
+                existing_ids.add(product_id)
+            elif key_type != b'none':
+                raise self._outdated_format(product_id)
+        return existing_ids
 
     def create(self, product):
-        self.client.hmset(
-            self._format_key(product['id']),
-            product)
+        self.client.set(
+            self._format_key(product['id']), msgpack.packb(product))
 
     def decrement_stock(self, product_id, amount):
-        return self.client.hincrby(
-            self._format_key(product_id), 'in_stock', -amount)
+        return self.decrement_stocks([(product_id, amount)])[0]
+
+    def decrement_stocks(self, amounts):
+        amounts = [
+            (product_id, self._format_key(product_id), amount)
+            for product_id, amount in amounts
+        ]
+        keys = list({key for _, key, _ in amounts})
+
+        def decrement(pipe):
+            # Keys are watched, so the transaction is retried if any
+            # product changes between reading and writing it back.
+            products = dict(zip(keys, self._get_many(keys, client=pipe)))
+            in_stock = []
+            for product_id, key, amount in amounts:
+                product = products[key]
+                if product is None:
+                    raise NotFound(
+                        'Product ID {} does not exist'.format(product_id))
+                product['in_stock'] -= amount
+                in_stock.append(product['in_stock'])
+
+            pipe.multi()
+            for key, product in products.items():
+                pipe.set(key, msgpack.packb(product))
+            return in_stock
+
+        return self.client.transaction(
+            decrement, *keys, value_from_callable=True)
 
 
 class Storage(DependencyProvider):
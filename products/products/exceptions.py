@@ -1,2 +1,6 @@
 class NotFound(Exception):
     pass
+
+
+class OutdatedProductFormat(Exception):
+    pass
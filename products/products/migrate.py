@@ -0,0 +1,54 @@
+"""
+One-off migration of products stored as Redis hashes, the layout used
+before products were stored as msgpack blobs.
+
+Usage::
+
+    python -m products.migrate config.yml
+
+Products already stored as blobs are left untouched, so it is safe to
+run before every start of the products service.
+"""
+import sys
+
+import msgpack
+import redis
+from nameko import config
+from nameko.cli.utils.config import setup_config
+
+from products.dependencies import REDIS_URI_KEY
+
+
+def _from_hash(document):
+    return {
+        'id': document[b'id'].decode('utf-8'),
+        'title': document[b'title'].decode('utf-8'),
+        'passenger_capacity': int(document[b'passenger_capacity']),
+        'maximum_speed': int(document[b'maximum_speed']),
+        'in_stock': int(document[b'in_stock'])
+    }
+
+
+def migrate(client):
+    """ Rewrite every `products:*` hash as a msgpack blob and return the
+    number of products migrated.
+    """
+    migrated = 0
+    for key in client.scan_iter('products:*'):
+        if client.type(key) != b'hash':
+            continue
+        product = _from_hash(client.hgetall(key))
+        client.set(key, msgpack.packb(product))
+        migrated += 1
+    return migrated
+
+
+def main(config_path):
+    with open(config_path) as config_file:
+        setup_config(config_file)
+    client = redis.StrictRedis.from_url(config.get(REDIS_URI_KEY))
+    print('Migrated {} product(s)'.format(migrate(client)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'config.yml')
@@ -8,6 +8,10 @@ from products import dependencies, schemas
 
 logger = logging.getLogger(__name__)
 
+_PRODUCT_SCHEMA = schemas.Product()
+_PRODUCTS_SCHEMA = schemas.Product(many=True)
+_LOAD_PRODUCT_SCHEMA = schemas.Product(strict=True)
+
 
 class ProductsService:
 
@@ -18,20 +22,32 @@ class ProductsService:
     @rpc
     def get(self, product_id):
         product = self.storage.get(product_id)
-        return schemas.Product().dump(product).data
+        return _PRODUCT_SCHEMA.dump(product).data
 
     @rpc
     def list(self):
         products = self.storage.list()
-        return schemas.Product(many=True).dump(products).data
+        return _PRODUCTS_SCHEMA.dump(products).data
+
+    @rpc
+    def list_map(self, product_ids):
+        products = self.storage.list_map(product_ids)
+        return {
+            product_id: _PRODUCT_SCHEMA.dump(product).data
+            for product_id, product in products.items()
+        }
+
+    @rpc
+    def exists(self, product_ids):
+        return list(self.storage.exists(product_ids))
 
     @rpc
     def create(self, product):
-        product = schemas.Product(strict=True).load(product).data
+        product = _LOAD_PRODUCT_SCHEMA.load(product).data
         self.storage.create(product)
 
     @event_handler('orders', 'order_created')
     def handle_order_created(self, payload):
-        for product in payload['order']['order_details']:
-            self.storage.decrement_stock(
-                product['product_id'], product['quantity'])
+        self.storage.decrement_stocks(
+            (product['product_id'], product['quantity'])
+            for product in payload['order']['order_details'])
@@ -10,8 +10,10 @@ setup(
     py_modules=['products'],
     install_requires=[
         "marshmallow==2.19.2",
+        "msgpack==1.0.5",
         "nameko==v3.0.0-rc6",
-        "redis==3.2.1",
+        "orjson==3.8.3",
+        "redis==3.5.3",
     ],
     extras_require={
         'dev': [
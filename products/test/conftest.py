@@ -1,3 +1,4 @@
+import msgpack
 import pytest
 import redis
 
@@ -36,9 +37,9 @@ def create_product(redis_client, product):
     def create(**overrides):
         new_product = product.copy()
         new_product.update(**overrides)
-        redis_client.hmset(
+        redis_client.set(
             'products:{}'.format(new_product['id']),
-            new_product)
+            msgpack.packb(new_product))
         return new_product
     return create
 
@@ -1,3 +1,4 @@
+import msgpack
 import pytest
 from mock import Mock
 
@@ -19,6 +20,32 @@ def test_get_fails_on_not_found(storage):
     assert 'Product ID 2 does not exist' == exc.value.args[0]
 
 
+def test_get_fails_on_outdated_format(storage, redis_client):
+    redis_client.hset('products:LZ127', mapping={'id': 'LZ127'})
+
+    with pytest.raises(storage.OutdatedProductFormat) as exc:
+        storage.get('LZ127')
+    assert 'products.migrate' in exc.value.args[0]
+
+
+@pytest.mark.parametrize('read', [
+    lambda storage: storage.list(),
+    lambda storage: storage.list_map(['LZ127', 'LZ129']),
+    lambda storage: storage.exists(['LZ127', 'LZ129']),
+    lambda storage: storage.decrement_stocks([('LZ127', 1), ('LZ129', 1)]),
+])
+def test_reads_fail_on_outdated_format(
+    read, storage, create_product, redis_client
+):
+    create_product(id='LZ127', in_stock=10)
+    redis_client.hset('products:LZ129', mapping={'id': 'LZ129'})
+
+    with pytest.raises(storage.OutdatedProductFormat) as exc:
+        read(storage)
+    assert 'Product ID LZ129' in exc.value.args[0]
+    assert 10 == storage.get('LZ127')['in_stock']
+
+
 def test_get(storage, products):
     product = storage.get('LZ129')
     assert 'LZ129' == product['id']
@@ -34,18 +61,26 @@ def test_list(storage, products):
         products == sorted(list(listed_products), key=lambda x: x['id']))
 
 
+def test_list_map(storage, products):
+    product_map = storage.list_map(['LZ127', 'LZ130', 'LZ127', 'unknown'])
+    assert {
+        'LZ127': products[0],
+        'LZ130': products[2],
+    } == product_map
+
+
+def test_exists(storage, products):
+    assert {'LZ127', 'LZ130'} == storage.exists(
+        ['LZ127', 'LZ130', 'LZ127', 'unknown'])
+
+
 def test_create(product, redis_client, storage):
 
     storage.create(product)
 
-    stored_product = redis_client.hgetall('products:LZ127')
+    stored_product = msgpack.unpackb(redis_client.get('products:LZ127'))
 
-    assert product['id'] == stored_product[b'id'].decode('utf-8')
-    assert product['title'] == stored_product[b'title'].decode('utf-8')
-    assert product['maximum_speed'] == int(stored_product[b'maximum_speed'])
-    assert product['passenger_capacity'] == (
-        int(stored_product[b'passenger_capacity']))
-    assert product['in_stock'] == int(stored_product[b'in_stock'])
+    assert product == stored_product
 
 
 def test_decrement_stock(storage, create_product, redis_client):
@@ -57,8 +92,33 @@ def test_decrement_stock(storage, create_product, redis_client):
 
     assert 7 == in_stock
     product_one, product_two, product_three = [
-        redis_client.hgetall('products:{}'.format(id_))
+        msgpack.unpackb(redis_client.get('products:{}'.format(id_)))
+        for id_ in (1, 2, 3)]
+    assert 10 == product_one['in_stock']
+    assert 7 == product_two['in_stock']
+    assert 12 == product_three['in_stock']
+
+
+def test_decrement_stocks(storage, create_product, redis_client):
+    create_product(id=1, title='LZ 127', in_stock=10)
+    create_product(id=2, title='LZ 129', in_stock=11)
+    create_product(id=3, title='LZ 130', in_stock=12)
+
+    in_stock = storage.decrement_stocks([(1, 1), (3, 5), (1, 2)])
+
+    assert [9, 7, 7] == in_stock
+    product_one, product_two, product_three = [
+        msgpack.unpackb(redis_client.get('products:{}'.format(id_)))
         for id_ in (1, 2, 3)]
-    assert b'10' == product_one[b'in_stock']
-    assert b'7' == product_two[b'in_stock']
-    assert b'12' == product_three[b'in_stock']
+    assert 7 == product_one['in_stock']
+    assert 11 == product_two['in_stock']
+    assert 7 == product_three['in_stock']
+
+
+def test_decrement_stocks_fails_on_not_found(storage, create_product):
+    create_product(id=1, title='LZ 127', in_stock=10)
+
+    with pytest.raises(storage.NotFound):
+        storage.decrement_stocks([(1, 3), (2, 1)])
+
+    assert 10 == storage.get(1)['in_stock']
@@ -0,0 +1,16 @@
+import msgpack
+
+from products.migrate import migrate
+
+
+def test_migrate(redis_client, create_product, product):
+    legacy_product = dict(product, id='LZ129', title='LZ 129 Hindenburg')
+    redis_client.hset('products:LZ129', mapping=legacy_product)
+    create_product()
+
+    assert 1 == migrate(redis_client)
+
+    assert legacy_product == msgpack.unpackb(
+        redis_client.get('products:LZ129'))
+    assert product == msgpack.unpackb(redis_client.get('products:LZ127'))
+    assert 0 == migrate(redis_client)
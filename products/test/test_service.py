@@ -1,10 +1,12 @@
 from marshmallow.exceptions import ValidationError
+import msgpack
 from nameko.testing.services import entrypoint_hook
 from nameko.standalone.events import event_dispatcher
 from nameko.testing.services import entrypoint_waiter
 import pytest
 
 from products.dependencies import NotFound
+from products.exceptions import OutdatedProductFormat
 from products.service import ProductsService
 
 
@@ -48,19 +50,40 @@ def test_list_productis_when_empty(service_container):
     assert [] == listed_products
 
 
+def test_list_map_products(products, service_container):
+
+    with entrypoint_hook(service_container, 'list_map') as list_map:
+        product_map = list_map(['LZ129', 'LZ130', 'unknown'])
+
+    assert {'LZ129': products[1], 'LZ130': products[2]} == product_map
+
+
+def test_products_exist(products, service_container):
+
+    with entrypoint_hook(service_container, 'exists') as exists:
+        existing_ids = exists(['LZ129', 'LZ130', 'unknown'])
+
+    assert ['LZ129', 'LZ130'] == sorted(existing_ids)
+
+
+def test_products_exist_fails_on_outdated_format(
+    products, redis_client, service_container
+):
+    redis_client.hset('products:LZ131', mapping={'id': 'LZ131'})
+
+    with pytest.raises(OutdatedProductFormat):
+        with entrypoint_hook(service_container, 'exists') as exists:
+            exists(['LZ129', 'LZ131'])
+
+
 def test_create_product(product, redis_client, service_container):
 
     with entrypoint_hook(service_container, 'create') as create:
         create(product)
 
-    stored_product = redis_client.hgetall('products:LZ127')
+    stored_product = msgpack.unpackb(redis_client.get('products:LZ127'))
 
-    assert product['id'] == stored_product[b'id'].decode('utf-8')
-    assert product['title'] == stored_product[b'title'].decode('utf-8')
-    assert product['maximum_speed'] == int(stored_product[b'maximum_speed'])
-    assert product['passenger_capacity'] == (
-        int(stored_product[b'passenger_capacity']))
-    assert product['in_stock'] == int(stored_product[b'in_stock'])
+    assert product == stored_product
 
 
 @pytest.mark.parametrize('product_overrides, expected_errors', [
@@ -145,8 +168,8 @@ def test_handle_order_created(
         dispatch('orders', 'order_created', payload)
 
     product_one, product_two, product_three = [
-        redis_client.hgetall('products:{}'.format(id_))
+        msgpack.unpackb(redis_client.get('products:{}'.format(id_)))
         for id_ in ('LZ127', 'LZ129', 'LZ130')]
-    assert b'6' == product_one[b'in_stock']
-    assert b'9' == product_two[b'in_stock']
-    assert b'12' == product_three[b'in_stock']
+    assert 6 == product_one['in_stock']
+    assert 9 == product_two['in_stock']
+    assert 12 == product_three['in_stock']
@@ -34,6 +34,9 @@ fi
     PYTHONPATH=. alembic upgrade head
 )
 
+# Convert any products still stored as Redis hashes for Products' backing service
+python -m products.migrate config.yml
+
 function cleanup {
   if [ -n "${FAST_PID}" ]; then
     kill -15 ${FAST_PID}